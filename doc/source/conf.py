@@ -14,8 +14,7 @@
 import os
 import sys
 
-import sphinx_rtd_theme
-from pkg_resources import get_distribution
+from importlib.metadata import version as get_version
 
 # Adjust path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
@@ -25,21 +24,28 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pa
 
 # If your documentation needs a minimal Sphinx version, state it here.
 #
-# needs_sphinx = '1.0'
+# Sphinx 6.2+ keeps the pickled doctrees in memory instead of re-reading them from disk for each reference.
+needs_sphinx = '6.2'
 
 # Add any Sphinx extension module names here, as strings. They can be
 # extensions coming with Sphinx (named 'sphinx.ext.*') or your custom
 # ones.
-extensions = [
-    'sphinx.ext.autodoc',
+_BASE_EXTENSIONS = [
+    'autoapi.extension',
     'sphinx.ext.napoleon',
     'sphinx.ext.intersphinx',
     'sphinx.ext.todo',
     'sphinx.ext.coverage',
-    'sphinx.ext.viewcode',
     'sphinx.ext.githubpages',
     'sphinxarg.ext',
 ]
+# Extensions that are slow and not needed while iterating on the documentation, skipped if HOMER_DOCS_FAST is set.
+_FULL_EXTENSIONS = [
+    'sphinx.ext.viewcode',
+]
+extensions = list(_BASE_EXTENSIONS)
+if not os.environ.get('HOMER_DOCS_FAST'):
+    extensions.extend(_FULL_EXTENSIONS)
 
 # Add any paths that contain templates here, relative to this directory.
 templates_path = ['_templates']
@@ -65,7 +71,7 @@ author = 'Riccardo Coccioli'
 # built documents.
 #
 # The full version, including alpha/beta/rc tags.
-release = get_distribution('homer').version
+release = get_version('homer')
 # The short X.Y version.
 version = release
 
@@ -91,8 +97,8 @@ todo_include_todos = True
 
 # -- Options for HTML output ----------------------------------------------
 
+# The theme registers itself with Sphinx and is loaded only by the HTML builders, no need to import it here
 html_theme = 'sphinx_rtd_theme'
-html_theme_path = [sphinx_rtd_theme.get_html_theme_path()]
 
 # Add any paths that contain custom static files (such as style sheets) here,
 # relative to this directory. They are copied after the builtin static files,
@@ -134,7 +140,14 @@ napoleon_use_param = True
 napoleon_use_rtype = True
 napoleon_use_keyword = True
 
-# Autodoc settings
+# AutoAPI settings, parse the source code statically instead of importing the modules
+autoapi_dirs = [os.path.join(os.pardir, os.pardir, 'homer')]
+autoapi_ignore = ['*/tests/*']
+# The API pages are not generated automatically, autodoc-style directives are used in the api/*.rst files instead
+autoapi_generate_api_docs = False
+autoapi_add_toctree_entry = False
+
+# Autodoc settings, used also by the AutoAPI autodoc-style directives
 autodoc_default_options = {
     # Using None as value instead of True to support the version of Sphinx used in Buster
     'members': None,
@@ -142,25 +155,33 @@ autodoc_default_options = {
     'show-inheritance': None,
 }
 autoclass_content = 'both'
+if os.environ.get('HOMER_DOCS_FAST'):
+    # Skip resolving and rendering the type hints in the signatures, they are documented in the docstrings too
+    autodoc_typehints = 'none'
 
 
 # -- Helper functions -----------------------------------------------------
 
-def skip_external_inherited(app, what, name, obj, skip, options):
-    """Skip methods inherited from external libraries."""
-    if not (what == 'class' and hasattr(obj, 'im_class') and obj.__name__ not in obj.im_class.__dict__):
-        return
+def skip_imported_and_undocumented(app, what, name, obj, skip, options):
+    """Skip the imported names and the undocumented members, that autodoc skipped by default."""
+    if skip or not hasattr(obj, 'imported'):  # Already skipped or not an AutoAPI object
+        return None
+
+    if obj.imported:
+        return True
+
+    if obj.docstring:
+        return None
+
+    # Keep the NamedTuple classes and their fields, autodoc documented them with their generated docstrings
+    parent = app.env.autoapi_all_objects.get(obj.id.rsplit('.', 1)[0])
+    if 'tuple' in getattr(obj, 'bases', []) or 'tuple' in getattr(parent, 'bases', []):
+        return None
 
-    classes = [obj.im_class]
-    while classes:
-        c = classes.pop()
-        if obj.__name__ in c.__dict__:  # Found the class that defined the method
-            return 'homer' not in c.__module__  # Skip if from external libraries
-        else:
-            classes = list(c.__bases__) + classes  # Continue in the inheritance tree
+    return True
 
 
 def setup(app):
-    """Register the filter_namedtuple_docstrings function."""
-    app.connect('autodoc-skip-member', skip_external_inherited)
+    """Register the skip_imported_and_undocumented function and the custom CSS file."""
+    app.connect('autodoc-skip-member', skip_imported_and_undocumented)
     app.add_css_file('theme_overrides.css')  # override wide tables in RTD theme
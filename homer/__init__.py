@@ -5,41 +5,58 @@ import pathlib
 import sys
 
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from importlib import import_module
-from typing import Callable, DefaultDict, Dict, List, Mapping, Optional, Tuple
+from typing import Any, Callable, DefaultDict, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING, Union
 
-import pynetbox
-
-from pkg_resources import DistributionNotFound, get_distribution
-from requests import Session
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
-
-from homer.capirca import CapircaGenerate
-from homer.config import HierarchicalConfig, load_yaml_config
 from homer.devices import Device, Devices
 from homer.exceptions import HomerAbortError, HomerConnectError, HomerError, HomerTimeoutError
-from homer.netbox import NetboxData, NetboxDeviceData, NetboxInventory
-from homer.templates import Renderer
 from homer.transports import DEFAULT_PORT, DEFAULT_TIMEOUT
-from homer.transports.junos import connected_device
+
+if TYPE_CHECKING:  # pragma: no cover - the heavy Capirca, Netbox and transport modules are imported only when needed
+    from homer.capirca import CapircaGenerate
+    from homer.netbox import NetboxData
 
 
 TIMEOUT_ATTEMPTS = 3
 """:py:class:`int`: the number of attempts to try when there is a timeout."""
 DIFF_EXIT_CODE = 99
 """:py:class:`int`: the exit code used when the diff command is executed and there is a diff."""
+NETBOX_POOL_SIZE = 32
+""":py:class:`int`: the default maximum number of pooled HTTP connections to Netbox."""
 
 
-try:
-    __version__ = get_distribution('homer').version  # Must be the same used as 'name' in setup.py
-    """:py:class:`str`: the version of the current Homer package."""
-except DistributionNotFound:  # pragma: no cover - this should never happen during tests
-    pass  # package is not installed
-
 logger = logging.getLogger(__name__)
 
 
+def __getattr__(name: str) -> str:
+    """Lazily resolve the package version on first access to avoid reading the package metadata at import time.
+
+    Arguments:
+        name (str): the name of the module attribute being accessed.
+
+    Raises:
+        AttributeError: if the attribute is not ``__version__`` or the package is not installed.
+
+    Returns:
+        str: the version of the current Homer package for ``__version__``.
+
+    """
+    if name != '__version__':
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    # Imported here as importlib.metadata is slow to import and needed only to resolve the version
+    from importlib.metadata import PackageNotFoundError, version  # pylint: disable=import-outside-toplevel
+
+    try:
+        package_version = version('homer')  # Must be the same used as 'name' in setup.py
+    except PackageNotFoundError as e:  # pragma: no cover - this should never happen during tests
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from e  # package is not installed
+
+    globals()['__version__'] = package_version  # Cache it, next accesses will not call this function
+    return package_version
+
+
 class Homer:
     """The instance to run Homer."""
 
@@ -53,6 +70,10 @@ class Homer:
             main_config (dict): the configuration dictionary.
 
         """
+        # Imported here to not load PyYAML and Jinja when importing the package, e.g. for the CLI help
+        from homer.config import HierarchicalConfig, load_yaml_config  # pylint: disable=import-outside-toplevel
+        from homer.templates import Renderer  # pylint: disable=import-outside-toplevel
+
         logger.debug('Initialized with configuration: %s', main_config)
         self._main_config = main_config
         self.private_base_path = self._main_config['base_paths'].get('private', '')
@@ -61,34 +82,49 @@ class Homer:
 
         self._netbox_api = None
         self._device_plugin = None
+        netbox_session = None
         if self._main_config.get('netbox', {}):
+            import pynetbox  # pylint: disable=import-outside-toplevel
+
+            from requests import Session  # pylint: disable=import-outside-toplevel
+            from requests.adapters import HTTPAdapter  # pylint: disable=import-outside-toplevel
+            from urllib3.util import Retry  # pylint: disable=import-outside-toplevel
+
             self._netbox_api = pynetbox.api(
                 self._main_config['netbox']['url'], token=self._main_config['netbox']['token'], threading=True)
-            retry_session = Session()
-            retry_adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=1))
-            retry_session.mount('http://', retry_adapter)
-            retry_session.mount('https://', retry_adapter)
-            self._netbox_api.http_session = retry_session
+            netbox_session = Session()
+            # Allow enough pooled connections for the pynetbox threads and the concurrent device actions
+            pool_size = self._main_config['netbox'].get('pool_size', NETBOX_POOL_SIZE)
+            retry_adapter = HTTPAdapter(
+                max_retries=Retry(total=3, backoff_factor=1), pool_connections=pool_size, pool_maxsize=pool_size)
+            netbox_session.mount('http://', retry_adapter)
+            netbox_session.mount('https://', retry_adapter)
+            self._netbox_api.http_session = netbox_session
             if self._main_config['netbox'].get('plugin', ''):
                 self._device_plugin = import_module(
                     self._main_config['netbox']['plugin']).NetboxDeviceDataPlugin
 
         devices_all_config = load_yaml_config(
             os.path.join(self._main_config['base_paths']['public'], 'config', 'devices.yaml'))
-        devices_config = {fqdn: data.get('config', {}) for fqdn, data in devices_all_config.items()}
+        # Split the device-specific configuration from the device metadata in a single pass
+        devices_config = {}
+        devices = {}
+        for fqdn, data in devices_all_config.items():
+            devices_config[fqdn] = data.get('config', {})
+            devices[fqdn] = {key: value for key, value in data.items() if key != 'config'}
 
         netbox_inventory = self._main_config.get('netbox', {}).get('inventory', {})
-        devices = devices_all_config.copy()
-        for data in devices.values():
-            data.pop('config', None)
 
         if netbox_inventory:
             # Get the data from Netbox while keeping any existing metadata from the devices.yaml file.
             # The data from Netbox overrides the existing keys for each device, if both present.
+            from homer.netbox import NetboxInventory  # pylint: disable=import-outside-toplevel
+
             netbox_devices = NetboxInventory(
                 self._main_config['netbox'],
                 netbox_inventory['device_roles'],
-                netbox_inventory['device_statuses']).get_devices()
+                netbox_inventory['device_statuses'],
+                session=netbox_session).get_devices()
             for fqdn, data in netbox_devices.items():
                 if fqdn in devices:
                     devices[fqdn].update(data)
@@ -100,23 +136,31 @@ class Homer:
             private_devices_config = load_yaml_config(
                 os.path.join(self.private_base_path, 'config', 'devices.yaml'))
 
-        self._ignore_warning = self._main_config.get('transports', {}).get('junos', {}).get('ignore_warning', False)
-        self._transport_username = self._main_config.get('transports', {}).get('username', '')
-        self._transport_timeout = self._main_config.get('transports', {}).get('timeout', DEFAULT_TIMEOUT)
-        self._port = self._main_config.get('transports', {}).get('port', DEFAULT_PORT)
-        transport_ssh_config = self._main_config.get('transports', {}).get('ssh_config', None)
+        transports_config = self._main_config.get('transports', {})
+        self._ignore_warning = transports_config.get('junos', {}).get('ignore_warning', False)
+        transport_ssh_config = transports_config.get('ssh_config', None)
         if transport_ssh_config is not None:
             transport_ssh_config = str(pathlib.Path(transport_ssh_config).expanduser())
-        self._transport_ssh_config = transport_ssh_config
+        # Arguments to connect to the devices, port and timeout can be overridden by each device metadata
+        self._connect_args = {
+            'username': transports_config.get('username', ''),
+            'ssh_config': transport_ssh_config,
+            'port': transports_config.get('port', DEFAULT_PORT),
+            'timeout': transports_config.get('timeout', DEFAULT_TIMEOUT),
+        }
         self._devices = Devices(devices, devices_config, private_devices_config)
-        self._renderer = Renderer(self._main_config['base_paths']['public'], self.private_base_path)
+        self._renderer = Renderer(self._main_config['base_paths']['public'], self.private_base_path,
+                                  cache_config=self._main_config.get('templates_cache', {}))
         self._output_base_path = pathlib.Path(self._main_config['base_paths']['output'])
+        self._capirca: Optional['CapircaGenerate'] = None
 
-    def generate(self, query: str) -> int:
+    def generate(self, query: str, *, concurrency: Optional[int] = None) -> int:
         """Generate the configuration only saving it locally, no remote action is performed.
 
         Arguments:
             query (str): the query to select the devices.
+            concurrency (int, optional): how many devices to save in parallel while generating the next ones. If
+                not set the ``concurrency`` value of the main configuration is used, defaulting to ``1``.
 
         Return:
             int: ``0`` on success, a small positive integer on failure.
@@ -124,22 +168,24 @@ class Homer:
         """
         logger.info('Generating configuration for query %s', query)
         self._prepare_out_dir()
-        successes, _ = self._execute(self._device_generate, query)
+        successes, _ = self._execute(self._device_generate, query, concurrency=concurrency)
         return Homer._parse_results(successes)
 
-    def diff(self, query: str, *, omit_diff: bool = False) -> int:
+    def diff(self, query: str, *, omit_diff: bool = False, concurrency: Optional[int] = None) -> int:
         """Generate the configuration and check the diff with the current live one.
 
         Arguments:
             query (str): the query to select the devices.
             omit_diff (bool, optional): whether to not show the actual diff to avoid leak of private data.
+            concurrency (int, optional): how many devices to diff in parallel while generating the next ones. If
+                not set the ``concurrency`` value of the main configuration is used, defaulting to ``1``.
 
         Return:
             int: ``0`` on success, a small positive integer on failure.
 
         """
         logger.info('Generating diff for query %s', query)
-        successes, diffs = self._execute(self._device_diff, query)
+        successes, diffs = self._execute(self._device_diff, query, concurrency=concurrency)
         has_diff = False
         for diff, diff_devices in diffs.items():
             print(f'Changes for {len(diff_devices)} devices: {diff_devices}')
@@ -173,7 +219,8 @@ class Homer:
 
         """
         logger.info('Committing config for query %s with message: %s', query, message)
-        successes, _ = self._execute(self._device_commit, query, message=message)
+        # Always serial, as each device asks for an interactive confirmation
+        successes, _ = self._execute(self._device_commit, query, concurrency=1, message=message)
         return Homer._parse_results(successes)
 
     def _device_generate(self, device: Device, device_config: str, _: int) -> Tuple[bool, Optional[str]]:
@@ -190,9 +237,16 @@ class Homer:
 
         """
         output_path = self._output_base_path / f'{device.fqdn}{Homer.OUT_EXTENSION}'
-        with open(str(output_path), 'w', encoding='utf-8') as f:
-            f.write(device_config)
-            logger.info('Written configuration for %s in %s', device.fqdn, output_path)
+        # Encode the whole configuration at once and write it without the buffered text layer
+        data = memoryview(device_config.encode('utf-8'))
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)  # Same mode of open(), umask applies
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+        logger.info('Written configuration for %s in %s', device.fqdn, output_path)
 
         return True, None
 
@@ -210,10 +264,9 @@ class Homer:
             to load the new configuration in the device to generate the diff.
 
         """
-        timeout = device.metadata.get('timeout', self._transport_timeout)
-        port = device.metadata.get('port', self._port)
-        with connected_device(device.fqdn, username=self._transport_username, port=port,
-                              ssh_config=self._transport_ssh_config, timeout=timeout) as connection:
+        from homer.transports.junos import connected_device  # pylint: disable=import-outside-toplevel
+
+        with connected_device(device.fqdn, **self._get_connect_args(device)) as connection:
             return connection.commit_check(device_config, self._ignore_warning)
 
     def _device_commit(self, device: Device, device_config: str,  # noqa: MC0001; pylint: disable=no-self-use
@@ -254,11 +307,10 @@ class Homer:
             else:
                 raise HomerAbortError('Too many invalid answers, commit aborted')
 
+        from homer.transports.junos import connected_device  # pylint: disable=import-outside-toplevel
+
         is_retry = attempt != 1
-        timeout = device.metadata.get('timeout', self._transport_timeout)
-        port = device.metadata.get('port', self._port)
-        with connected_device(device.fqdn, username=self._transport_username, port=port,
-                              ssh_config=self._transport_ssh_config, timeout=timeout) as connection:
+        with connected_device(device.fqdn, **self._get_connect_args(device)) as connection:
             try:
                 connection.commit(device_config, message, callback, ignore_warning=self._ignore_warning,
                                   is_retry=is_retry)
@@ -273,19 +325,44 @@ class Homer:
 
             return False, ''
 
+    def _get_connect_args(self, device: Device) -> Dict[str, Any]:
+        """Get the arguments to connect to a device, applying the device-specific overrides.
+
+        Arguments:
+            device (homer.devices.Device): the device instance.
+
+        Returns:
+            dict: the keyword arguments to pass to :py:func:`homer.transports.junos.connected_device`.
+
+        """
+        connect_args = self._connect_args.copy()
+        for key in ('port', 'timeout'):
+            if key in device.metadata:
+                connect_args[key] = device.metadata[key]
+
+        return connect_args
+
     def _prepare_out_dir(self) -> None:
         """Prepare the out directory creating the directory if doesn't exists and deleting any pre-generated file."""
         self._output_base_path.mkdir(parents=True, exist_ok=True)
-        for path in self._output_base_path.iterdir():
-            if path.is_file() and path.suffix == Homer.OUT_EXTENSION:
-                path.unlink()
-
-    def _execute(self, callback: Callable, query: str, **kwargs: str) -> Tuple[Dict, DefaultDict]:  # noqa, mccabe: MC0001 too complex
+        # DirEntry.is_file() uses the file type returned by the directory listing, without an additional stat call
+        with os.scandir(self._output_base_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(Homer.OUT_EXTENSION) and entry.is_file():
+                    os.unlink(entry.path)
+
+    def _execute(self, callback: Callable, query: str, *,  # noqa, mccabe: MC0001 too complex
+                 concurrency: Optional[int] = None,
+                 **kwargs: str) -> Tuple[Dict, DefaultDict]:
         """Execute Homer based on the given action and query.
 
         Arguments:
             callback (Callable): the callback to call for each device.
             query (str): the query to filter the devices to act on.
+            concurrency (int, optional): the number of devices for which to call the callback in parallel. When
+                greater than one the callbacks are run in a pool of threads while the configuration of the next
+                devices is generated, otherwise each device is fully processed before moving to the next one. If
+                not set the ``concurrency`` value of the main configuration is used, defaulting to ``1``.
             **kwargs (str): any additional keyword argument to pass to the callback
 
         Returns:
@@ -295,56 +372,122 @@ class Homer:
             configuration differences and as values the list of device FQDN that reported that diff.
 
         """
-        diffs: DefaultDict[str, list] = defaultdict(list)
+        diffs: DefaultDict[Optional[str], list] = defaultdict(list)
         successes: Dict[bool, list] = {True: [], False: []}
+        devices = self._devices.query(query)
         netbox_data = None
         if self._netbox_api is not None:
+            from homer.netbox import NetboxData, prefetch_devices  # pylint: disable=import-outside-toplevel
+
             logger.info('Gathering global Netbox data')
             netbox_data = NetboxData(self._netbox_api)
-
-        for device in self._devices.query(query):
-            logger.info('Generating configuration for %s', device.fqdn)
-
-            try:
-                device_config = []
-                device_data = self._config.get(device)
-                # Render the ACLs using Capirca
-                if 'capirca' in device_data and not self._main_config.get('capirca', {}).get('disabled', False):
-                    capirca = CapircaGenerate(self._main_config, device_data['capirca'], self._netbox_api)
-                    generated_acls = capirca.generate_acls()
-                    if generated_acls:
-                        device_config.extend(generated_acls)
-
-                if netbox_data is not None:
-                    device_data['netbox'] = {
-                        'global': netbox_data,
-                        'device': NetboxDeviceData(self._netbox_api, device),
-                    }
-
-                    if self._device_plugin is not None:
-                        device_data['netbox']['device_plugin'] = self._device_plugin(self._netbox_api, device)
-                # Render the Jinja templates based on yaml + netbox data
-                device_config.append(self._renderer.render(device.metadata['role'], device_data))
-            except HomerError:
-                logger.exception('Device %s failed to render the template, skipping.', device.fqdn)
-                successes[False].append(device.fqdn)
+            prefetch_devices(self._netbox_api, devices)
+        self._capirca = None  # Instantiated only if needed, shared across the devices of this run
+
+        if concurrency is None:
+            concurrency = self._main_config.get('concurrency', 1)
+        executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+        results: List[Tuple[str, Union[None, Tuple[bool, Optional[str]], Future]]] = []
+        try:
+            for device in devices:
+                device_config = self._render(device, netbox_data)
+                if device_config is None:
+                    results.append((device.fqdn, None))
+                elif executor is None:
+                    results.append((device.fqdn, self._run_callback(callback, device, device_config, **kwargs)))
+                else:
+                    results.append((device.fqdn, executor.submit(
+                        self._run_callback, callback, device, device_config, **kwargs)))
+
+            if executor is not None:
+                executor.shutdown()
+        except BaseException:  # Also on KeyboardInterrupt, don't act on the devices not yet started
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            raise
+
+        # Aggregate the results in the main thread and in the same order of the devices
+        for fqdn, result in results:
+            if result is None:  # Failed to render the configuration
+                successes[False].append(fqdn)
                 continue
 
-            for attempt in range(1, TIMEOUT_ATTEMPTS + 1):
-                try:
-                    device_success, device_diff = callback(device, '\n'.join(device_config), attempt, **kwargs)
-                    break
-                except (HomerTimeoutError, HomerConnectError) as e:
-                    logger.error('Attempt %d/%d failed: %s', attempt, TIMEOUT_ATTEMPTS, e)
-            else:
-                device_success = False
-                device_diff = ''
+            if isinstance(result, Future):
+                result = result.result()
 
-            successes[device_success].append(device.fqdn)
-            diffs[device_diff].append(device.fqdn)
+            device_success, device_diff = result
+            successes[device_success].append(fqdn)
+            diffs[device_diff].append(fqdn)
 
         return successes, diffs
 
+    def _render(self, device: Device, netbox_data: Optional['NetboxData']) -> Optional[str]:
+        """Generate the configuration for a device.
+
+        Arguments:
+            device (homer.devices.Device): the device instance.
+            netbox_data (homer.netbox.NetboxData, None): the global Netbox data, if Netbox is configured.
+
+        Returns:
+            str: the generated configuration.
+            None: if unable to generate the configuration.
+
+        """
+        logger.info('Generating configuration for %s', device.fqdn)
+        try:
+            device_config = []
+            device_data = self._config.get(device)
+            # Render the ACLs using Capirca
+            if 'capirca' in device_data and not self._main_config.get('capirca', {}).get('disabled', False):
+                if self._capirca is None:
+                    from homer.capirca import CapircaGenerate  # pylint: disable=import-outside-toplevel
+
+                    self._capirca = CapircaGenerate(self._main_config, self._netbox_api)
+                generated_acls = self._capirca.generate_acls(device_data['capirca'])
+                if generated_acls:
+                    device_config.extend(generated_acls)
+
+            if netbox_data is not None:
+                from homer.netbox import NetboxDeviceData  # pylint: disable=import-outside-toplevel
+
+                device_data['netbox'] = {
+                    'global': netbox_data,
+                    'device': NetboxDeviceData(self._netbox_api, device),
+                }
+
+                if self._device_plugin is not None:
+                    device_data['netbox']['device_plugin'] = self._device_plugin(self._netbox_api, device)
+            # Render the Jinja templates based on yaml + netbox data
+            device_config.append(self._renderer.render(device.metadata['role'], device_data))
+        except HomerError:
+            logger.exception('Device %s failed to render the template, skipping.', device.fqdn)
+            return None
+
+        return '\n'.join(device_config)
+
+    @staticmethod
+    def _run_callback(callback: Callable, device: Device, device_config: str,
+                      **kwargs: str) -> Tuple[bool, Optional[str]]:
+        """Call the callback for a device, retrying it on timeout or connection errors.
+
+        Arguments:
+            callback (Callable): the callback to call.
+            device (homer.devices.Device): the device instance.
+            device_config (str): the generated configuration for the device.
+            **kwargs (str): any additional keyword argument to pass to the callback
+
+        Returns:
+            tuple: the two-element tuple returned by the callback or ``(False, '')`` if all the attempts failed.
+
+        """
+        for attempt in range(1, TIMEOUT_ATTEMPTS + 1):
+            try:
+                return callback(device, device_config, attempt, **kwargs)
+            except (HomerTimeoutError, HomerConnectError) as e:
+                logger.error('Attempt %d/%d failed: %s', attempt, TIMEOUT_ATTEMPTS, e)
+
+        return False, ''
+
     @staticmethod
     def _parse_results(successes: Mapping[bool, List[Device]]) -> int:
         """Parse the results dictionary, log and return the approriate exit status code.
@@ -4,7 +4,7 @@ import logging
 
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Mapping
+from typing import Dict, List, Mapping, Sequence, Tuple
 
 import pynetbox
 
@@ -20,17 +20,18 @@ logger = logging.getLogger(__name__)
 class CapircaGenerate():
     """Class to generate ACLs with Capirca."""
 
-    def __init__(self, config: Mapping, device_policies: List[str], netbox: pynetbox.api):
+    def __init__(self, config: Mapping, netbox: pynetbox.api):
         """Initialize the instance.
 
+        The instance can be shared across devices, the generated ACLs are cached by policy.
+
         Arguments:
             config (dict): the Homer config.
-            device_policies (list): List of Capirca policies to generate.
             netbox (pynetbox.api): the Netbox API instance.
 
         """
         self._config = config
-        self._device_policies = device_policies
+        self._generated: Dict[str, Tuple[List[str], str]] = {}
         self._public_policies_dir = Path(self._config['base_paths']['public'], 'policies')
         self._private_base_path = self._config['base_paths'].get('private', None)
         definitions_path = Path(self._config['base_paths']['public'], 'definitions')
@@ -52,70 +53,93 @@ class CapircaGenerate():
             # ParseNetworkList expects an array of lines, while Netbox API returns a string with \n
             self.definitions.ParseNetworkList(netbox_definitons.splitlines())
 
-    def generate_acls(self) -> List[str]:  # noqa, mccabe: MC0001 too complex
-        """Generate the ACLs using Capirca lib.
+    def generate_acls(self, device_policies: Sequence[str]) -> List[str]:
+        """Generate the ACLs using Capirca lib, re-using the ones already generated for the same policy.
+
+        Arguments:
+            device_policies (list): List of Capirca policies to generate.
+
+        Raises:
+            HomerError: if unable to generate any of the policies.
 
         Returns:
             list: a list of policies as strings in the proper format.
 
         """
         generated_acls = []
-        if self._private_base_path:
-            private_policies_dir = Path(self._private_base_path, 'policies')
-
         # Store failures if any
         failures = []
         # Iterate over all policies defined for a given device
-        for policy_name in self._device_policies:
-            # We don't know yet if the files below exist
-            public_policy_file = Path(self._public_policies_dir, policy_name + '.yaml')
-            private_policy_file = Path()
-            if self._private_base_path:
-                private_policy_file = Path(private_policies_dir, policy_name + '.yaml')
-            # If same file in both private and public, prefer private
-            if private_policy_file.is_file():
-                policy_file = private_policy_file
-                policies_dir = private_policies_dir
-            elif public_policy_file.is_file():
-                policy_file = public_policy_file
-                policies_dir = self._public_policies_dir
+        for policy_name in device_policies:
+            if policy_name not in self._generated:
+                self._generated[policy_name] = self._generate_policy(policy_name)
+
+            acls, failure = self._generated[policy_name]
+            if failure:
+                failures.append(failure)
             else:
-                failures.append(f"Can't find Capirca policy file {policy_name}.")
-                continue
-            try:
-                policy_object = aerleon_yaml.ParseFile(str(policy_file),
-                                                       base_dir=policies_dir,
-                                                       definitions=self.definitions,
-                                                       optimize=True,
-                                                       shade_check=False,
-                                                       )
-            except policy.ShadingError as e:
-                # Term "hiding" another term
-                failures.append(f"Shading errors for {policy_name}: {e}.")
-                continue
-            except (policy.Error, naming.Error) as e:
-                failures.append(f"Error parsing {policy_name}: {e}.")
-                continue
-
-            # https://github.com/google/capirca/blob/master/capirca/aclgen.py#L222
-            platforms = set()
-            for header in policy_object.headers:
-                platforms.update(header.platforms)
-            try:
-                found_platform = False
-                if 'juniper' in platforms:
-                    found_platform = True
-                    generated_acls.append(str(juniper.Juniper(policy_object, exp_info=2)))
-                if 'srx' in platforms:
-                    found_platform = True
-                    generated_acls.append(str(junipersrx.JuniperSRX(policy_object, exp_info=2)))
-                if not found_platform:
-                    failures.append(f"Unknown platform: {platforms}.")
-
-            except (juniper.Error) as e:
-                failures.append(f"Error generating {policy_name}: {e}.")
-                continue
+                generated_acls.extend(acls)
+
         if failures:
             raise HomerError("Capirca error(s)\n" + '\n'.join(failures))
 
         return generated_acls
+
+    def _generate_policy(self, policy_name: str) -> Tuple[List[str], str]:
+        """Generate the ACLs of a single policy using Capirca lib.
+
+        Arguments:
+            policy_name (str): the name of the Capirca policy to generate.
+
+        Returns:
+            tuple: a two-element tuple with the list of generated ACLs as strings in the proper format as first item
+            and the failure message as second item, empty string on success.
+
+        """
+        # We don't know yet if the files below exist
+        public_policy_file = Path(self._public_policies_dir, policy_name + '.yaml')
+        private_policy_file = Path()
+        if self._private_base_path:
+            private_policies_dir = Path(self._private_base_path, 'policies')
+            private_policy_file = Path(private_policies_dir, policy_name + '.yaml')
+        # If same file in both private and public, prefer private
+        if private_policy_file.is_file():
+            policy_file = private_policy_file
+            policies_dir = private_policies_dir
+        elif public_policy_file.is_file():
+            policy_file = public_policy_file
+            policies_dir = self._public_policies_dir
+        else:
+            return [], f"Can't find Capirca policy file {policy_name}."
+
+        try:
+            policy_object = aerleon_yaml.ParseFile(str(policy_file),
+                                                   base_dir=policies_dir,
+                                                   definitions=self.definitions,
+                                                   optimize=True,
+                                                   shade_check=False,
+                                                   )
+        except policy.ShadingError as e:
+            # Term "hiding" another term
+            return [], f"Shading errors for {policy_name}: {e}."
+        except (policy.Error, naming.Error) as e:
+            return [], f"Error parsing {policy_name}: {e}."
+
+        # https://github.com/google/capirca/blob/master/capirca/aclgen.py#L222
+        platforms = set()
+        for header in policy_object.headers:
+            platforms.update(header.platforms)
+
+        generated_acls = []
+        try:
+            if 'juniper' in platforms:
+                generated_acls.append(str(juniper.Juniper(policy_object, exp_info=2)))
+            if 'srx' in platforms:
+                generated_acls.append(str(junipersrx.JuniperSRX(policy_object, exp_info=2)))
+        except (juniper.Error) as e:
+            return [], f"Error generating {policy_name}: {e}."
+
+        if not generated_acls:
+            return [], f"Unknown platform: {platforms}."
+
+        return generated_acls, ''
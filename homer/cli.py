@@ -3,10 +3,36 @@ import argparse
 import logging
 import sys
 
-from typing import Optional
+from typing import Any, Optional, Sequence, Union
 
-from homer import __version__, Homer
-from homer.config import load_yaml_config
+from homer import Homer
+
+
+class VersionAction(argparse.Action):
+    """Argparse action to print the version and exit, resolving the version only when requested."""
+
+    def __init__(self, option_strings: Sequence[str], dest: str = argparse.SUPPRESS, **kwargs: Any):
+        """Initialize the action as a flag without arguments.
+
+        Arguments:
+            option_strings (list): the option strings of the action.
+            dest (str, optional): the destination attribute name, not set in the parsed arguments by default.
+            **kwargs (mixed): any additional keyword argument to pass to :py:class:`argparse.Action`.
+
+        """
+        super().__init__(option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs)
+
+    def __call__(self, parser: argparse.ArgumentParser, namespace: argparse.Namespace,
+                 values: Union[str, Sequence[Any], None], option_string: Optional[str] = None) -> None:
+        """Print the version and exit, reading the package metadata only now as it's slow.
+
+        Parameters according to :py:meth:`argparse.Action.__call__`.
+
+        """
+        from homer import __version__  # pylint: disable=import-outside-toplevel
+
+        print(f'{parser.prog} {__version__}')
+        parser.exit()
 
 
 def argument_parser() -> argparse.ArgumentParser:
@@ -24,18 +50,24 @@ def argument_parser() -> argparse.ArgumentParser:
     group.add_argument('-q', '--quiet', action='store_const', const=logging.WARN, dest='loglevel',
                        help='Silent mode, only log warnings',)
     parser.add_argument('-c', '--config', default='/etc/homer/config.yaml', help='Main configuration file to load.')
-    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    parser.add_argument('--version', action=VersionAction, help="show program's version number and exit")
     parser.add_argument('query', help='Select which devices to target')
 
     subparsers = parser.add_subparsers(help='Action to perform: generate, diff, commit', dest='action')
     subparsers.required = True
 
-    subparsers.add_parser('generate', help='Generate the configurations locally.')
+    generate = subparsers.add_parser('generate', help='Generate the configurations locally.')
+    generate.add_argument('-j', '--concurrency', type=int,
+                          help=('How many devices to save in parallel while generating the next ones. Defaults to '
+                                'the concurrency value of the configuration file or 1.'))
 
     diff = subparsers.add_parser('diff', help=('Perform a commit check and show the differences between the generated '
                                                'configuration and the live one.'))
     diff.add_argument('-o', '--omit-diff', action='store_true',
                       help='Omit the actual diff to prevent the leak of private data')
+    diff.add_argument('-j', '--concurrency', type=int,
+                      help=('How many devices to diff in parallel while generating the next ones. Defaults to the '
+                            'concurrency value of the configuration file or 1.'))
 
     commit = subparsers.add_parser('commit', help='Actually commit the generated configuration to the devices.')
     commit.add_argument('message', help='A mandatory commit message. The running username will be automatically added.')
@@ -62,8 +94,12 @@ def main(argv: Optional[list] = None) -> int:
     kwargs = {}
     if args.action == 'commit':
         kwargs['message'] = args.message
-    elif args.action == 'diff':
-        kwargs['omit_diff'] = args.omit_diff
+    else:
+        kwargs['concurrency'] = args.concurrency
+        if args.action == 'diff':
+            kwargs['omit_diff'] = args.omit_diff
+
+    from homer.config import load_yaml_config  # pylint: disable=import-outside-toplevel
 
     config = load_yaml_config(args.config)
     runner = Homer(config)
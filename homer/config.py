@@ -6,7 +6,7 @@ import os
 import re
 
 from copy import deepcopy
-from typing import Dict, Union
+from typing import Dict, Tuple, Union
 
 import yaml
 
@@ -62,6 +62,23 @@ def ip_address_constructor(loader: yaml.loader.SafeLoader,
         return value
 
 
+class YamlLoader(getattr(yaml, 'CSafeLoader', yaml.SafeLoader)):  # type: ignore[misc]
+    """YAML safe loader with Homer's IP constructors and implicit resolvers.
+
+    It uses the faster LibYAML-based loader if PyYAML was built with it (the PyPI wheels are), falling back to the pure
+    Python one. Being a dedicated subclass, the resolvers don't affect other libraries using PyYAML's loaders.
+    """
+
+
+# Register the IP constructors only once, adding the implicit resolvers again would grow the loader's resolvers lists
+YamlLoader.add_constructor('!ip_network', ip_network_constructor)
+YamlLoader.add_implicit_resolver(
+    '!ip_network', re.compile(r"^(\d+\.\d+\.\d+\.\d+|(?:[\da-f]{0,4}:){2,7}[\da-f]{0,4})/\d+$"), None)
+YamlLoader.add_constructor('!ip_address', ip_address_constructor)
+YamlLoader.add_implicit_resolver(
+    '!ip_address', re.compile(r"^(\d+\.\d+\.\d+\.\d+|(?:[\da-f]{0,4}:){2,7}[\da-f]{0,4})$"), None)
+
+
 def load_yaml_config(config_file: str) -> Dict:
     """Parse a YAML config file and return it.
 
@@ -75,20 +92,14 @@ def load_yaml_config(config_file: str) -> Dict:
         HomerError: if failed to load the configuration.
 
     """
-    network_re = re.compile(r"^(\d+\.\d+\.\d+\.\d+|(?:[\da-f]{0,4}:){2,7}[\da-f]{0,4})/\d+$")
-    ip_re = re.compile(r"^(\d+\.\d+\.\d+\.\d+|(?:[\da-f]{0,4}:){2,7}[\da-f]{0,4})$")
-    yaml.SafeLoader.add_constructor("!ip_network", ip_network_constructor)
-    yaml.SafeLoader.add_implicit_resolver('!ip_network', network_re, None)
-    yaml.SafeLoader.add_constructor("!ip_address", ip_address_constructor)
-    yaml.SafeLoader.add_implicit_resolver('!ip_address', ip_re, None)
-
     config: Dict = {}
     if not os.path.exists(config_file):
         return config
 
     try:
         with open(config_file, 'r', encoding='utf-8') as fh:
-            config = yaml.safe_load(fh)
+            # YamlLoader is either SafeLoader or CSafeLoader
+            config = yaml.load(fh, Loader=YamlLoader)  # nosec
 
     except Exception as e:
         raise HomerError(f'Could not load config file {config_file}: {e}') from e
@@ -117,6 +128,7 @@ class HierarchicalConfig:
 
         """
         self._configs: Dict[str, Dict] = {}
+        self._parents: Dict[Tuple[str, str], Tuple[Dict, Dict]] = {}
         paths = {'public': base_path, 'private': private_base_path}
         for path, name in itertools.product(paths.keys(), ('common', 'roles', 'sites')):
             if paths[path]:
@@ -142,22 +154,44 @@ class HierarchicalConfig:
         """
         role = device.metadata.get('role', '')
         site = device.metadata.get('site', '')
+        public_parent, private_parent = self._get_parents(role, site)
         # Deepcopying the common configurations to protect from any side effect
         public = {
-            **deepcopy(self._configs['public_common']),
-            **deepcopy(self._configs['public_roles'].get(role, {})),
-            **deepcopy(self._configs['public_sites'].get(site, {})),
+            **deepcopy(public_parent),
             **device.config,
             **{'metadata': device.metadata, 'hostname': device.fqdn},  # Inject also FQDN and device metadata
         }
-        private = {
-            **self._configs['private_common'],
-            **self._configs['private_roles'].get(role, {}),
-            **self._configs['private_sites'].get(site, {}),
-            **device.private,
-        }
+        private = {**private_parent, **device.private}
         keys = public.keys() & private.keys()
         if keys:
             raise HomerError(f'Configuration key(s) found in both public and private config: {keys}')
 
         return {**public, **deepcopy(private)}
+
+    def _get_parents(self, role: str, site: str) -> Tuple[Dict, Dict]:
+        """Get the public and private configuration merged up to the site level, caching it for subsequent calls.
+
+        Arguments:
+            role (str): the device role.
+            site (str): the device site.
+
+        Returns:
+            tuple: a two-element tuple with the public and private merged configuration dictionaries. The override
+            order is: ``common``, ``role``, ``site``. They must not be modified by the caller.
+
+        """
+        key = (role, site)
+        if key not in self._parents:
+            public = {
+                **self._configs['public_common'],
+                **self._configs['public_roles'].get(role, {}),
+                **self._configs['public_sites'].get(site, {}),
+            }
+            private = {
+                **self._configs['private_common'],
+                **self._configs['private_roles'].get(role, {}),
+                **self._configs['private_sites'].get(site, {}),
+            }
+            self._parents[key] = (public, private)
+
+        return self._parents[key]
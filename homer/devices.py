@@ -1,10 +1,11 @@
 """Devices module."""
 import fnmatch
 import logging
+import sys
 
 from collections import UserDict
 from operator import attrgetter
-from typing import List, Mapping, MutableMapping, NamedTuple, Optional
+from typing import Any, List, Mapping, MutableMapping, NamedTuple, Optional
 
 
 Device = NamedTuple('Device', [('fqdn', str), ('metadata', MutableMapping), ('config', Mapping), ('private', Mapping)])
@@ -33,6 +34,8 @@ class Devices(UserDict):
             private_config = {}
 
         for fqdn, metadata in devices.items():
+            # Intern the metadata strings, the keys and values like role and site are repeated across all devices
+            metadata = {Devices._intern(key): Devices._intern(value) for key, value in metadata.items()}
             self.data[fqdn] = Device(fqdn, metadata, devices_config.get(fqdn, {}), private_config.get(fqdn, {}))
 
         logger.info('Initialized %d devices', len(self.data))
@@ -56,8 +59,27 @@ class Devices(UserDict):
         if ':' in query_string:  # Simple key-value query
             key, value = query_string.split(':', 1)
             results = [device for device in self.data.values() if device.metadata.get(key, None) == value]
-        else:  # FQDN query
-            results = [device for fqdn, device in self.items() if fnmatch.fnmatch(fqdn, query_string)]
+        elif not any(char in query_string for char in '*?['):  # Literal FQDN query, no need to match all devices
+            results = [self.data[query_string]] if query_string in self.data else []
+        else:  # FQDN query, fnmatch.filter() compiles the pattern only once for all the devices
+            results = [self.data[fqdn] for fqdn in fnmatch.filter(self.data, query_string)]
 
         logger.info("Matched %d device(s) for query '%s'", len(results), query_string)
         return sorted(results, key=attrgetter('fqdn'))
+
+    @staticmethod
+    def _intern(value: Any) -> Any:
+        """Intern the given value if it's a string, to share a single instance of it across devices.
+
+        Arguments:
+            value (mixed): the value to intern.
+
+        Returns:
+            mixed: the interned string or the given value if it's not a string.
+
+        """
+        # Exact type check as sys.intern() doesn't accept str subclasses
+        if type(value) is str:  # pylint: disable=unidiomatic-typecheck
+            return sys.intern(value)
+
+        return value
@@ -15,6 +15,31 @@ from homer.exceptions import HomerError
 
 
 logger = logging.getLogger(__name__)
+PREFETCH_BATCH_SIZE = 100
+""":py:class:`int`: the maximum number of devices to request to Netbox with a single API call when prefetching."""
+
+
+def prefetch_devices(api: pynetbox.api, devices: Sequence[Device]) -> None:
+    """Fetch the Netbox objects of the given devices in batches and store them into each device metadata.
+
+    The device-specific Netbox data classes will re-use the prefetched object instead of fetching each device on its
+    own. Devices without a Netbox ID in their metadata are skipped. The IDs are compared as strings, as the GraphQL
+    inventory returns them as strings while the Netbox API objects have integer IDs.
+
+    Arguments:
+        api (pynetbox.api): the Netbox API instance.
+        devices (list): a sequence of :py:class:`homer.devices.Device` instances.
+
+    """
+    ids = [str(device.metadata['id']) for device in devices if 'id' in device.metadata]
+    netbox_objects = {}
+    for i in range(0, len(ids), PREFETCH_BATCH_SIZE):
+        for netbox_object in api.dcim.devices.filter(id=ids[i:i + PREFETCH_BATCH_SIZE]):
+            netbox_objects[str(netbox_object.id)] = netbox_object
+
+    for device in devices:
+        if 'id' in device.metadata:
+            device.metadata['netbox_object'] = netbox_objects.get(str(device.metadata['id']))
 
 
 class BaseNetboxData(UserDict):
@@ -66,7 +91,8 @@ class BaseNetboxDeviceData(BaseNetboxData):
         """
         super().__init__(api)
         self._device = device
-        self._device.metadata['netbox_object'] = api.dcim.devices.get(id=device.metadata['id'])
+        if self._device.metadata.get('netbox_object') is None:  # Not already prefetched
+            self._device.metadata['netbox_object'] = api.dcim.devices.get(id=device.metadata['id'])
 
 
 class NetboxData(BaseNetboxData):
@@ -85,6 +111,30 @@ class NetboxData(BaseNetboxData):
 class NetboxDeviceData(BaseNetboxDeviceData):
     """Dynamic dictionary to gather the required device-specific data from Netbox."""
 
+    def __init__(self, api: pynetbox.api, device: Device):
+        """Initialize the dictionary.
+
+        Arguments:
+            api (pynetbox.api): the Netbox API instance.
+            device (homer.devices.Device): the device for which to gather the data.
+
+        """
+        super().__init__(api, device)
+        self._interfaces: Optional[List[Any]] = None
+
+    def _device_interfaces(self) -> List[Any]:
+        """Returns the device interfaces, fetching them only once as they are needed by multiple keys.
+
+        Returns:
+            list: a list of pynetbox interface objects.
+
+        """
+        if self._interfaces is None:
+            device_id = self._device.metadata['netbox_object'].id
+            self._interfaces = list(self._api.dcim.interfaces.filter(device_id=device_id))
+
+        return self._interfaces
+
     def _get_virtual_chassis_members(self) -> Optional[List[Dict[str, Any]]]:
         """Returns a list of devices part of the same virtual chassis or None.
 
@@ -106,9 +156,8 @@ class NetboxDeviceData(BaseNetboxDeviceData):
             list: A list of circuits.
 
         """
-        device_id = self._device.metadata['netbox_object'].id
         circuits = {}
-        for a_int in self._api.dcim.interfaces.filter(device_id=device_id):
+        for a_int in self._device_interfaces():
             # b_int is either the patch panel interface facing out or the initial interface
             # if no patch panel
             # Using link_peers[0] to mimic pre-Netbox 3.3 behavior, when a cable only had one termination
@@ -141,9 +190,7 @@ class NetboxDeviceData(BaseNetboxDeviceData):
 
         """
         vlans = {}
-        device_id = self._device.metadata['netbox_object'].id
-
-        for interface in self._api.dcim.interfaces.filter(device_id=device_id):
+        for interface in self._device_interfaces():
             if interface.untagged_vlan and interface.untagged_vlan.vid not in vlans:
                 vlans[interface.untagged_vlan.vid] = interface.untagged_vlan
             if interface.tagged_vlans:
@@ -165,16 +212,20 @@ class NetboxDeviceData(BaseNetboxDeviceData):
 class NetboxInventory:
     """Use Netbox as inventory to gather the list of devices to manage."""
 
-    def __init__(self, config: dict, device_roles: Sequence[str], device_statuses: Sequence[str]):
+    def __init__(self, config: dict, device_roles: Sequence[str], device_statuses: Sequence[str], *,
+                 session: Optional[requests.Session] = None):
         """Initialize the instance.
 
         Arguments:
             config (dict): Homer's configuration section about Netbox
             device_roles (list): a sequence of Netbox device role slug strings to filter the devices.
             device_statuses (list): a sequence of Netbox device status label or value strings to filter the devices.
+            session (requests.Session, optional): the HTTP session to use to reach Netbox, to share its connection
+                pool with other Netbox clients. If not set a new session is created.
 
         """
         self._config = config
+        self._session = session if session is not None else requests.Session()
         self._device_roles = device_roles
         self._device_statuses = [status.lower() for status in device_statuses]
 
@@ -203,13 +254,9 @@ class NetboxInventory:
         data: dict[str, Union[str, dict]] = {"query": query}
         if variables is not None:
             data["variables"] = variables
+        headers = {"Authorization": f"Token {self._config['token']}", "User-Agent": "Homer"}
         try:
-            session = requests.Session()
-            session.headers.update(
-                {"Authorization": f"Token {self._config['token']}",
-                 "User-Agent": "Homer"}
-            )
-            response = session.post(f"{self._config['url']}/graphql/", json=data, timeout=15)
+            response = self._session.post(f"{self._config['url']}/graphql/", json=data, headers=headers, timeout=15)
             response.raise_for_status()
             return response.json()['data']
         except RequestException as error:
@@ -2,7 +2,7 @@
 import logging
 import os
 
-from typing import Mapping
+from typing import Mapping, Optional
 
 import jinja2
 
@@ -10,12 +10,14 @@ from homer.exceptions import HomerError
 
 
 logger = logging.getLogger(__name__)
+TEMPLATES_CACHE_SIZE = 400
+""":py:class:`int`: the maximum number of compiled templates to keep in memory."""
 
 
 class Renderer:
     """Load and render templates."""
 
-    def __init__(self, base_path: str, base_private_path: str = ''):
+    def __init__(self, base_path: str, base_private_path: str = '', *, cache_config: Optional[Mapping] = None):
         """Initialize the instance.
 
         Arguments:
@@ -23,18 +25,61 @@ class Renderer:
                 relative to this base path.
             base_private_path (str, optional): a secondary base path to initialize the Jinja2 environment with.
                 Templates that are not found in base_path will be looked up in this secondary private location.
+            cache_config (dict, optional): the configuration of the persistent cache of the compiled templates, with
+                the optional keys ``disabled`` to not use it and ``directory`` to store it in a specific directory
+                instead of a private per-user directory created by Jinja in the system temporary directory.
 
         """
         paths = [os.path.join(base_path, 'templates')]
         if base_private_path:
             paths.append(os.path.join(base_private_path, 'templates'))
 
+        # Persist the templates bytecode across runs, invalidated automatically when the template source changes.
+        # It's just an optimization, if the directory can't be used the templates are compiled on each run.
+        if cache_config is None:
+            cache_config = {}
+        bytecode_cache = None
+        if not cache_config.get('disabled', False):
+            try:
+                bytecode_cache = Renderer._get_bytecode_cache(cache_config.get('directory'))
+            except (OSError, RuntimeError) as e:
+                logger.debug('Unable to use the templates bytecode cache, continuing without it: %s', e)
+
+        # Keep the compiled templates in memory, they are rendered for many devices and don't change during a run.
         self._env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(paths),
             undefined=jinja2.StrictUndefined,
             trim_blocks=True,
             lstrip_blocks=True,
-            cache_size=0)
+            auto_reload=False,
+            cache_size=TEMPLATES_CACHE_SIZE,
+            bytecode_cache=bytecode_cache)
+
+    @staticmethod
+    def _get_bytecode_cache(directory: Optional[str]) -> jinja2.FileSystemBytecodeCache:
+        """Return the persistent cache of the compiled templates.
+
+        Arguments:
+            directory (str, optional): the directory where to store the cache, created if missing. If not set a private
+                per-user directory created by Jinja in the system temporary directory is used.
+
+        Returns:
+            jinja2.FileSystemBytecodeCache: the bytecode cache instance.
+
+        Raises:
+            OSError: if the directory can't be created or is not writable.
+            RuntimeError: if Jinja is unable to use its default directory.
+
+        """
+        if directory is None:
+            return jinja2.FileSystemBytecodeCache()
+
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not os.access(directory, os.W_OK | os.X_OK):
+            raise OSError(f'Directory {directory} is not writable')
+
+        return jinja2.FileSystemBytecodeCache(directory)
 
     def render(self, template_name: str, data: Mapping) -> str:
         """Render a template with the given data.
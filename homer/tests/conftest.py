@@ -0,0 +1,10 @@
+"""Pytest customization for the tests."""
+import tempfile
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_tempdir(tmp_path, monkeypatch):
+    """Use a per-test temporary directory as the system one, to not leave any file behind (i.e. the templates cache)."""
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
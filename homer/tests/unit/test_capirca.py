@@ -0,0 +1,81 @@
+"""Capirca module tests."""
+from unittest import mock
+
+import pytest
+
+from aerleon.lib import juniper
+from aerleon.lib import yaml as aerleon_yaml
+
+from homer.capirca import CapircaGenerate
+from homer.exceptions import HomerError
+from homer.tests import get_fixture_path
+
+
+def get_filters(acls):
+    """Return the names of the filters defined in the given generated ACLs."""
+    return [line.split()[2] for acl in acls for line in acl.splitlines() if line.strip().startswith('replace: filter')]
+
+
+class TestCapircaGenerate:
+    """CapircaGenerate class tests."""
+
+    def setup_method(self):
+        """Initialize the instance."""
+        # pylint: disable=attribute-defined-outside-init
+        self.config = {
+            'base_paths': {
+                'public': get_fixture_path('capirca', 'public'),
+                'private': get_fixture_path('capirca', 'private'),
+            },
+        }
+        self.capirca = CapircaGenerate(self.config, None)
+
+    def test_generate_acls_ok(self):
+        """It should generate the ACLs of all the given policies in order."""
+        assert get_filters(self.capirca.generate_acls(['ssh', 'ntp'])) == ['ssh-in', 'ntp-in']
+
+    @mock.patch('homer.capirca.juniper.Juniper', wraps=juniper.Juniper)
+    @mock.patch('homer.capirca.aerleon_yaml.ParseFile', wraps=aerleon_yaml.ParseFile)
+    def test_generate_acls_shared_policy(self, mocked_parse_file, mocked_juniper):
+        """It should parse and generate only once a policy shared by different devices."""
+        first = self.capirca.generate_acls(['ssh', 'ntp'])
+        second = self.capirca.generate_acls(['ssh'])
+
+        assert get_filters(second) == ['ssh-in']
+        assert second[0] == first[0]
+        assert mocked_parse_file.call_count == 2
+        assert mocked_juniper.call_count == 2
+
+    @mock.patch('homer.capirca.aerleon_yaml.ParseFile', wraps=aerleon_yaml.ParseFile)
+    def test_generate_acls_cached_failure(self, mocked_parse_file):
+        """It should raise HomerError for each device using a failed policy, trying to generate it only once."""
+        for policies in (['invalid'], ['ssh', 'invalid']):
+            with pytest.raises(HomerError, match='Error parsing invalid: UNDEFINED'):
+                self.capirca.generate_acls(policies)
+
+        assert mocked_parse_file.call_count == 2  # invalid and ssh
+
+    def test_generate_acls_missing(self):
+        """It should raise HomerError if the policy file doesn't exists."""
+        with pytest.raises(HomerError, match="Can't find Capirca policy file missing"):
+            self.capirca.generate_acls(['missing'])
+
+    def test_generate_acls_unknown_platform(self):
+        """It should raise HomerError if the policy doesn't target any supported platform."""
+        with pytest.raises(HomerError, match="Unknown platform: {'cisco'}"):
+            self.capirca.generate_acls(['unknown'])
+
+    def test_generate_acls_private_override(self):
+        """It should prefer the private policy if the same policy exists also in the public directory."""
+        assert get_filters(self.capirca.generate_acls(['override'])) == ['private-override']
+
+    def test_generate_acls_public_only(self):
+        """It should use the public policy if there is no private base path."""
+        config = {'base_paths': {'public': get_fixture_path('capirca', 'public')}}
+        assert get_filters(CapircaGenerate(config, None).generate_acls(['override'])) == ['public-override']
+
+    def test_generate_acls_return_copy(self):
+        """It should return a new list each time, to protect the cached ACLs from any side effect."""
+        acls = self.capirca.generate_acls(['ssh'])
+        acls.append('modified')
+        assert len(self.capirca.generate_acls(['ssh'])) == 1
@@ -1,9 +1,13 @@
 """CLI module tests."""
 import argparse
 
+from unittest import mock
+
 import pytest
 import yaml
 
+import homer
+
 from homer import cli
 from homer.config import load_yaml_config
 from homer.tests import get_fixture_path
@@ -20,7 +24,17 @@ def test_version(capsys):
         cli.main(['--version'])
 
     out, _ = capsys.readouterr()
-    assert cli.__version__ in out
+    assert homer.__version__ in out
+
+
+def test_version_lazy():
+    """It should read the package version only if requested."""
+    homer.__dict__.pop('__version__', None)
+    with mock.patch('importlib.metadata.version') as mocked_version:
+        args = cli.argument_parser().parse_args(['device1.example.com', 'generate'])
+
+    assert not hasattr(args, 'version')
+    mocked_version.assert_not_called()
 
 
 def test_main(tmp_path):
@@ -34,3 +48,25 @@ def test_main(tmp_path):
         yaml.dump(config, f)
 
     assert cli.main(['-c', str(config_path), 'device1.example.com', 'generate']) == 0
+
+
+def test_main_concurrency(tmp_path):
+    """It should pass the concurrency to the selected action."""
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(yaml.dump({'base_paths': {'public': 'public', 'output': 'output'}}), encoding='utf-8')
+    with mock.patch('homer.cli.Homer') as mocked_homer:
+        mocked_homer.return_value.diff.return_value = 0
+        assert cli.main(['-c', str(config_path), 'device1.example.com', 'diff', '-j', '4']) == 0
+
+    mocked_homer.return_value.diff.assert_called_once_with('device1.example.com', omit_diff=False, concurrency=4)
+
+
+def test_main_concurrency_default(tmp_path):
+    """It should not set the concurrency if not passed, to fallback to the configuration file one."""
+    config_path = tmp_path / 'config.yaml'
+    config_path.write_text(yaml.dump({'base_paths': {'public': 'public', 'output': 'output'}}), encoding='utf-8')
+    with mock.patch('homer.cli.Homer') as mocked_homer:
+        mocked_homer.return_value.generate.return_value = 0
+        assert cli.main(['-c', str(config_path), 'device1.example.com', 'generate']) == 0
+
+    mocked_homer.return_value.generate.assert_called_once_with('device1.example.com', concurrency=None)
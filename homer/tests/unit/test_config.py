@@ -2,8 +2,9 @@
 import ipaddress
 
 import pytest
+import yaml
 
-from homer.config import HierarchicalConfig, load_yaml_config
+from homer.config import HierarchicalConfig, load_yaml_config, YamlLoader
 from homer.devices import Device
 from homer.exceptions import HomerError
 from homer.tests import get_fixture_path
@@ -44,6 +45,23 @@ def test_load_yaml_config_ipaddress_objects():
     assert isinstance(config['quoted_networkv6'], ipaddress.IPv6Network)
 
 
+def test_load_yaml_config_resolvers_registered_once(tmp_path):
+    """It should not register again the IP implicit resolvers on each load."""
+    resolvers = {key: len(value) for key, value in YamlLoader.yaml_implicit_resolvers.items()}
+    config_file = tmp_path / 'config.yaml'
+    config_file.write_text('ip: 10.0.0.1\n', encoding='utf-8')
+    assert load_yaml_config(str(config_file)) == {'ip': ipaddress.ip_address('10.0.0.1')}
+    assert {key: len(value) for key, value in YamlLoader.yaml_implicit_resolvers.items()} == resolvers
+
+
+def test_yaml_loader_isolated():
+    """It should register the IP constructors and resolvers only on Homer's own loader."""
+    assert '!ip_address' in YamlLoader.yaml_constructors
+    for loader in (yaml.SafeLoader, getattr(yaml, 'CSafeLoader', yaml.SafeLoader)):
+        assert '!ip_address' not in loader.yaml_constructors
+        assert yaml.load('ip: 10.0.0.1', Loader=loader) == {'ip': '10.0.0.1'}  # nosec
+
+
 def test_hierarchical_config_get_no_private():
     """Calling the get() method on an instance of HierarchicalConfig should return the config for a given Device."""
     device = Device('device1.example.com', {'role': 'roleA', 'site': 'siteA'}, {'device_key': 'device1_value'}, {})
@@ -67,6 +85,21 @@ def test_hierarchical_config_get_with_private():
     assert config.get(device) == expected
 
 
+def test_hierarchical_config_get_cached_parents():
+    """It should merge the common, role and site configuration only once for devices sharing role and site."""
+    device1 = Device('device1.example.com', {'role': 'roleA', 'site': 'siteA'}, {'device_key': 'device1_value'}, {})
+    device2 = Device('device2.example.com', {'role': 'roleA', 'site': 'siteA'}, {'device_key': 'device2_value'}, {})
+    config = HierarchicalConfig(get_fixture_path('public'))
+    config1 = config.get(device1)
+    config1['common_key'] = 'modified'  # Should not affect the other devices
+    config2 = config.get(device2)
+
+    assert len(config._parents) == 1  # pylint: disable=protected-access
+    assert config2['common_key'] == 'common_value'
+    assert config2['device_key'] == 'device2_value'
+    assert config2['hostname'] == 'device2.example.com'
+
+
 def test_hierarchical_config_get_duplicate_keys():
     """If there are duplicate keys between public and private configuration."""
     device = Device('device1.example.com', {'role': 'roleA', 'site': 'siteA'}, {'device_key': 'device_value'},
@@ -1,5 +1,6 @@
 """Devices module tests."""
 from collections import UserDict
+from unittest import mock
 
 from homer.config import load_yaml_config
 from homer.devices import Device, Devices
@@ -23,6 +24,15 @@ class TestDevices:
         assert isinstance(self.devices, Devices)
         assert isinstance(self.devices, UserDict)
 
+    def test_init_interned_metadata(self):
+        """Should share a single instance of the metadata strings across devices."""
+        devices = Devices({fqdn: {''.join(['ro', 'le']): ''.join(['role', 'A']), 'id': 1}
+                           for fqdn in ('device1.example.com', 'device2.example.com')}, {})
+        device1, device2 = devices['device1.example.com'], devices['device2.example.com']
+        assert device1.metadata == {'role': 'roleA', 'id': 1}
+        assert next(iter(device1.metadata)) is next(iter(device2.metadata))
+        assert device1.metadata['role'] is device2.metadata['role']
+
     def test_dict_access(self):
         """Should return the device with the given FQDN."""
         device = self.devices['device1.example.com']
@@ -66,6 +76,13 @@ class TestDevices:
         devices = self.devices.query('non-existent.example.com')
         assert devices == []
 
+    @mock.patch('homer.devices.fnmatch.filter')
+    def test_query_fqdn_literal(self, mocked_filter):
+        """Should lookup directly the device without matching all the devices if the query has no wildcards."""
+        devices = self.devices.query('device2.example.com')
+        assert [device.fqdn for device in devices] == ['device2.example.com']
+        assert not mocked_filter.called
+
     def test_query_fqdn_globbing(self):
         """Should return the matching devices."""
         devices = self.devices.query('device*.*.com')
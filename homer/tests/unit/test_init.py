@@ -1,7 +1,9 @@
 """__init__ module tests."""
 import json
+import os
 import textwrap
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest import mock
 
@@ -37,6 +39,23 @@ def test_version():
     assert hasattr(homer, '__version__')
 
 
+def test_version_cached():
+    """It should cache the version in the module namespace after the first access."""
+    homer.__dict__.pop('__version__', None)
+    with mock.patch('importlib.metadata.version', return_value='1.2.3') as mocked_version:
+        assert homer.__version__ == '1.2.3'
+        assert homer.__version__ == '1.2.3'
+
+    mocked_version.assert_called_once_with('homer')
+    homer.__dict__.pop('__version__')
+
+
+def test_getattr_raise():
+    """It should raise AttributeError when accessing a non-existent module attribute."""
+    with pytest.raises(AttributeError, match="module 'homer' has no attribute 'non_existent'"):
+        homer.non_existent  # pylint: disable=pointless-statement
+
+
 class TestHomer:
     """Homer class tests."""
 
@@ -74,6 +93,30 @@ class TestHomer:
         with open(str(self.output / 'device2.example.com.out'), encoding='utf-8') as f:
             assert textwrap.dedent(expected).lstrip('\n') == f.read()
 
+    def test_generate_partial_writes(self):
+        """It should write the whole configuration also if the data is written in multiple chunks."""
+        real_write = os.write
+        with mock.patch('homer.os.write', side_effect=lambda fd, data: real_write(fd, data[:10])) as mocked_write:
+            ret = self.homer.generate('device2.example.com')
+
+        assert ret == 0
+        assert mocked_write.call_count > 1
+        expected = """
+            roleB;
+            siteB;
+            device2.example.com;
+            common_value;
+            roleB_value;
+            siteB_value;
+            device2_value;
+            common_private_value;
+            roleB_private_value;
+            siteB_private_value;
+            device2_private_value;
+        """
+        with open(str(self.output / 'device2.example.com.out'), encoding='utf-8') as f:
+            assert textwrap.dedent(expected).lstrip('\n') == f.read()
+
     def test_generate_no_private(self):
         """It should execute the whole program based on CLI arguments."""
         config = self.config.copy()
@@ -120,6 +163,92 @@ class TestHomer:
         assert mocked_device.return_value.cu.diff.called
         assert expected in out
 
+    @mock.patch('homer.transports.junos.JunOSDevice')
+    def test_execute_diff_concurrency(self, mocked_device, capsys):
+        """It should diff the devices in parallel reporting the results in the devices order."""
+        mocked_device.return_value.cu.diff.return_value = 'some diff'
+        return_code = self.homer.diff('device*', concurrency=2)
+
+        out, _ = capsys.readouterr()
+        assert return_code == 99
+        assert mocked_device.return_value.cu.diff.call_count == 2
+        assert "Changes for 2 devices: ['device1.example.com', 'device2.example.com']\nsome diff" in out
+
+    @mock.patch('homer.ThreadPoolExecutor')
+    def test_generate_concurrency_from_config(self, mocked_executor):
+        """It should use the concurrency of the main configuration if not passed explicitly."""
+        mocked_executor.side_effect = ThreadPoolExecutor
+        config = self.config.copy()
+        config['concurrency'] = 3
+        ret = homer.Homer(config).generate('device*')
+
+        assert ret == 0
+        mocked_executor.assert_called_once_with(max_workers=3)
+
+    @mock.patch('homer.capirca.CapircaGenerate')
+    def test_execute_capirca_shared(self, mocked_capirca):
+        """It should instantiate Capirca once per run, sharing it across the devices, and prepend the ACLs."""
+        mocked_capirca.return_value.generate_acls.return_value = ['acl1', 'acl2']
+        get_config = self.homer._config.get  # pylint: disable=protected-access
+        with mock.patch.object(self.homer._config, 'get',  # pylint: disable=protected-access
+                               side_effect=lambda device: {**get_config(device), 'capirca': ['policy']}):
+            for _ in range(2):
+                assert self.homer.generate('device*') == 0
+
+        assert mocked_capirca.call_count == 2
+        mocked_capirca.assert_called_with(self.config, None)
+        assert mocked_capirca.return_value.generate_acls.call_args_list == [mock.call(['policy'])] * 4
+        assert (self.output / 'device1.example.com.out').read_text(encoding='utf-8').startswith('acl1\nacl2\n')
+
+    def test_generate_templates_cache_disabled(self):
+        """It should not use the templates bytecode cache if disabled in the configuration."""
+        config = {**self.config, 'templates_cache': {'disabled': True}}
+        runner = homer.Homer(config)
+
+        assert runner._renderer._env.bytecode_cache is None  # pylint: disable=protected-access
+        assert runner.generate('device*') == 0
+
+    @mock.patch('homer.capirca.CapircaGenerate')
+    def test_execute_capirca_disabled(self, mocked_capirca):
+        """It should not generate the ACLs if Capirca is disabled in the configuration."""
+        config = {**self.config, 'capirca': {'disabled': True}}
+        runner = homer.Homer(config)
+        get_config = runner._config.get  # pylint: disable=protected-access
+        with mock.patch.object(runner._config, 'get',  # pylint: disable=protected-access
+                               side_effect=lambda device: {**get_config(device), 'capirca': ['policy']}):
+            assert runner.generate('device*') == 0
+
+        mocked_capirca.assert_not_called()
+
+    @mock.patch('homer.ThreadPoolExecutor')
+    def test_execute_concurrency_interrupted(self, mocked_executor):
+        """It should cancel the callbacks not yet started if interrupted while generating the configurations."""
+        with mock.patch.object(self.homer, '_render', side_effect=['config', KeyboardInterrupt]):
+            with pytest.raises(KeyboardInterrupt):
+                self.homer.diff('device*', concurrency=2)
+
+        mocked_executor.return_value.submit.assert_called_once()
+        mocked_executor.return_value.shutdown.assert_called_once_with(cancel_futures=True)
+
+    @mock.patch('homer.ThreadPoolExecutor')
+    def test_execute_concurrency_interrupted_waiting(self, mocked_executor):
+        """It should cancel the callbacks not yet started if interrupted while waiting for the running ones."""
+        mocked_executor.return_value.shutdown.side_effect = [KeyboardInterrupt, None]
+        with mock.patch.object(self.homer, '_render', return_value='config'):
+            with pytest.raises(KeyboardInterrupt):
+                self.homer.diff('device*', concurrency=2)
+
+        assert mocked_executor.return_value.submit.call_count == 2
+        mocked_executor.return_value.shutdown.assert_has_calls([mock.call(), mock.call(cancel_futures=True)])
+
+    def test_generate_concurrency(self):
+        """It should generate the compiled configuration files in parallel, skipping the failed ones."""
+        ret = self.homer.generate('*', concurrency=4)
+
+        assert ret == 1
+        assert sorted(get_generated_files(self.output)) == [
+            'another.example.com.out', 'device1.example.com.out', 'device2.example.com.out', 'valid.example.com.out']
+
     @mock.patch('homer.transports.junos.JunOSDevice')
     def test_execute_diff_raise(self, mocked_device, capsys, caplog):
         """It should skip the device that raises an HomerLoadError."""
@@ -144,6 +273,22 @@ class TestHomer:
         assert ret == 0
         assert mocked_device.called
 
+    @mock.patch('homer.ThreadPoolExecutor')
+    @mock.patch('builtins.input')
+    @mock.patch('homer.sys.stdout.isatty')
+    @mock.patch('homer.transports.junos.JunOSDevice')
+    def test_execute_commit_serial(self, mocked_device, mocked_isatty, mocked_input, mocked_executor):
+        """It should commit serially also if the configuration sets a concurrency, as it asks for confirmation."""
+        mocked_isatty.return_value = True
+        mocked_input.return_value = 'yes'
+        mocked_device.return_value.cu.diff.return_value = 'diff'
+        config = self.config.copy()
+        config['concurrency'] = 4
+        ret = homer.Homer(config).commit('device*', message='commit message')
+        assert ret == 0
+        assert mocked_input.call_count == 2
+        mocked_executor.assert_not_called()
+
     @mock.patch('builtins.input')
     @mock.patch('homer.sys.stdout.isatty')
     @mock.patch('homer.transports.junos.JunOSDevice')
@@ -193,7 +338,7 @@ class TestHomerNetbox:
     """Homer class tests with Netbox enabled."""
 
     @pytest.fixture(autouse=True)
-    @mock.patch('homer.pynetbox.api')  # Pynetbox objects lazily resolve API objects, can't use autospec=True
+    @mock.patch('pynetbox.api')  # Pynetbox objects lazily resolve API objects, can't use autospec=True
     def setup_method_fixture(self, mocked_pynetbox, requests_mock, tmp_path):
         """Initialize the instance."""
         # pylint: disable=attribute-defined-outside-init
@@ -212,9 +357,21 @@ class TestHomerNetbox:
         self.mocked_pynetbox.assert_called_once_with('https://netbox.example.com',  # nosec
                                                      token='token',
                                                      threading=True)
+        adapter = self.mocked_pynetbox.return_value.http_session.get_adapter('https://netbox.example.com')
+        assert adapter._pool_maxsize == homer.NETBOX_POOL_SIZE  # pylint: disable=protected-access
 
-    @mock.patch('homer.NetboxDeviceData', autospec=True)
-    @mock.patch('homer.NetboxData', autospec=True)
+    @mock.patch('pynetbox.api')
+    def test_init_pool_size(self, mocked_pynetbox):
+        """It should use the configured size for the Netbox connection pool."""
+        config = self.config.copy()
+        config['netbox'] = {**config['netbox'], 'pool_size': 4}
+        homer.Homer(config)
+        adapter = mocked_pynetbox.return_value.http_session.get_adapter('https://netbox.example.com')
+        assert adapter._pool_connections == 4  # pylint: disable=protected-access
+        assert adapter._pool_maxsize == 4  # pylint: disable=protected-access
+
+    @mock.patch('homer.netbox.NetboxDeviceData', autospec=True)
+    @mock.patch('homer.netbox.NetboxData', autospec=True)
     def test_execute_generate(self, mocked_netbox_data, mocked_netbox_device_data):
         """It should generate the configuration for the given device, including netbox data."""
         mocked_netbox_data.return_value = {'netbox_key': 'netbox_value'}
@@ -245,9 +402,9 @@ class TestHomerNetbox:
         with open(str(self.output / 'device2.example.com.out'), encoding='utf-8') as f:
             assert textwrap.dedent(expected).lstrip('\n') == f.read()
 
-    @mock.patch('homer.NetboxDeviceData', autospec=True)
-    @mock.patch('homer.NetboxData', autospec=True)
-    @mock.patch('homer.NetboxInventory', autospec=True)
+    @mock.patch('homer.netbox.NetboxDeviceData', autospec=True)
+    @mock.patch('homer.netbox.NetboxData', autospec=True)
+    @mock.patch('homer.netbox.NetboxInventory', autospec=True)
     @mock.patch('homer.transports.junos.ConnectedDevice', autospec=True)
     @pytest.mark.parametrize('name, suffix, port, timeout', (('device1', 'A', 22, 30),
                                                              ('device2', 'B', 2222, 10)))
@@ -11,7 +11,7 @@ import pytest
 from homer.config import load_yaml_config
 from homer.devices import Device
 from homer.exceptions import HomerError
-from homer.netbox import BaseNetboxData, NetboxData, NetboxDeviceData, NetboxInventory
+from homer.netbox import BaseNetboxData, NetboxData, NetboxDeviceData, NetboxInventory, prefetch_devices
 from homer.tests import get_fixture_path
 
 
@@ -145,7 +145,7 @@ class TestNetboxDeviceData:
 
     def test_get_virtual_chassis_members_no_members(self):
         """If a device is not part of a virtual chassis it should return None."""
-        assert len(self.netbox_data['virtual_chassis_members']) == 0
+        assert self.netbox_data['virtual_chassis_members'] is None
 
     def test_get_virtual_chassis_members_with_members(self):
         """If a device is part of a virtual chassis it should return its members."""
@@ -202,6 +202,20 @@ class TestNetboxDeviceData:
         calls = [mock.call(1), mock.call(1)]
         self.netbox_api.circuits.circuits.get.assert_has_calls(calls)
 
+    def test_init_fetch(self):
+        """It should fetch the device object from Netbox if not already present in the metadata."""
+        device = Device('device1.example.com', {'id': 123}, {}, {})
+        NetboxDeviceData(self.netbox_api, device)
+        self.netbox_api.dcim.devices.get.assert_called_once_with(id=123)
+        assert device.metadata['netbox_object'] == self.netbox_api.dcim.devices.get.return_value
+
+    def test_interfaces_fetched_once(self):
+        """It should fetch the device interfaces only once when they are needed by multiple keys."""
+        self.netbox_api.dcim.interfaces.filter.return_value = []
+        assert self.netbox_data['circuits'] == {}
+        assert self.netbox_data['vlans'] == {}
+        self.netbox_api.dcim.interfaces.filter.assert_called_once_with(device_id=123)
+
     def test_get_vlans(self):
         """It should return the vlans defined on a device's interfaces."""
         interface1 = NetboxObject()  # This is a fake interface object
@@ -224,6 +238,30 @@ class TestNetboxDeviceData:
         self.netbox_api.dcim.interfaces.filter.assert_called_once()
 
 
+@pytest.mark.parametrize('get_id', (int, str))
+def test_prefetch_devices(get_id):
+    """It should fetch the devices objects in batches and store them in the devices metadata, with any type of ID."""
+    netbox_api = mock.MagicMock()
+    netbox_objects = []
+    for i in range(3):
+        netbox_object = NetboxObject()
+        netbox_object.id = i  # pylint: disable=invalid-name
+        netbox_objects.append(netbox_object)
+
+    netbox_api.dcim.devices.filter.side_effect = [netbox_objects[:2], netbox_objects[2:]]
+    devices = [Device(f'device{i}.example.com', {'id': get_id(i)}, {}, {}) for i in range(4)]
+    devices.append(Device('no-id.example.com', {}, {}, {}))
+
+    with mock.patch('homer.netbox.PREFETCH_BATCH_SIZE', 2):
+        prefetch_devices(netbox_api, devices)
+
+    netbox_api.dcim.devices.filter.assert_has_calls([mock.call(id=['0', '1']), mock.call(id=['2', '3'])])
+    for i in range(3):
+        assert devices[i].metadata['netbox_object'] is netbox_objects[i]
+    assert devices[3].metadata['netbox_object'] is None
+    assert 'netbox_object' not in devices[4].metadata
+
+
 class TestNetboxInventory:
     """NetboxInventory class tests."""
 
@@ -278,3 +316,15 @@ class TestNetboxInventory:
             expected[fqdn] = expected_device
 
         assert devices == expected
+
+    def test_get_devices_session(self):
+        """It should use the given HTTP session with the authentication headers."""
+        session = mock.MagicMock()
+        session.post.return_value.json.return_value = {'data': {'device_list': []}}
+        config = {'url': 'https://netbox.example.com', 'token': 'token'}  # nosec
+        inventory = NetboxInventory(config, ['roleA'], ['Active'], session=session)
+
+        assert inventory.get_devices() == {}
+        session.post.assert_called_once_with(
+            'https://netbox.example.com/graphql/', json=mock.ANY, timeout=15,
+            headers={'Authorization': 'Token token', 'User-Agent': 'Homer'})
@@ -1,4 +1,9 @@
 """Templates module tests."""
+import logging
+import tempfile
+
+from unittest import mock
+
 import pytest
 
 from homer.exceptions import HomerError
@@ -29,3 +34,68 @@ class TestRenderer:
             self.renderer.render('non_existent', {})
         with pytest.raises(HomerError, match='Could not render template key_error.conf'):
             self.renderer.render('key_error', {})
+
+    def test_render_cached(self):
+        """Should compile the template only once when rendering it multiple times."""
+        renderer = Renderer(get_fixture_path('templates'), '')
+        env = renderer._env  # pylint: disable=protected-access
+        with mock.patch.object(env, 'compile', wraps=env.compile) as mocked_compile:
+            assert renderer.render('valid', {'test_key': 'value1'}) == 'value1;'
+            assert renderer.render('valid', {'test_key': 'value2'}) == 'value2;'
+
+        mocked_compile.assert_called_once()
+
+
+def test_render_bytecode_cache(tmp_path):
+    """Should compile the template only once across instances thanks to the persistent bytecode cache."""
+    for _ in range(2):
+        renderer = Renderer(get_fixture_path('templates'), '')
+        env = renderer._env  # pylint: disable=protected-access
+        with mock.patch.object(env, 'compile', wraps=env.compile) as mocked_compile:
+            assert renderer.render('valid', {'test_key': 'test_value'}) == 'test_value;'
+
+    mocked_compile.assert_not_called()
+    assert list(tmp_path.iterdir())
+
+
+def test_render_bytecode_cache_unavailable(tmp_path, monkeypatch, caplog):
+    """Should render the templates without the bytecode cache if its directory can't be used."""
+    not_a_directory = tmp_path / 'file'
+    not_a_directory.write_text('', encoding='utf-8')
+    monkeypatch.setattr(tempfile, 'tempdir', str(not_a_directory))
+    with caplog.at_level(logging.DEBUG):
+        renderer = Renderer(get_fixture_path('templates'), '')
+
+    assert renderer.render('valid', {'test_key': 'test_value'}) == 'test_value;'
+    assert renderer._env.bytecode_cache is None  # pylint: disable=protected-access
+    assert 'Unable to use the templates bytecode cache' in caplog.text
+
+
+def test_render_bytecode_cache_directory(tmp_path):
+    """Should store the persistent bytecode cache in the configured directory, creating it if missing."""
+    cache_dir = tmp_path / 'cache'
+    renderer = Renderer(get_fixture_path('templates'), '', cache_config={'directory': str(cache_dir)})
+
+    assert renderer.render('valid', {'test_key': 'test_value'}) == 'test_value;'
+    assert list(cache_dir.glob('__jinja2_*.cache'))
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+
+
+def test_render_bytecode_cache_directory_not_writable(tmp_path, caplog):
+    """Should render the templates without the bytecode cache if the configured directory is not writable."""
+    with mock.patch('homer.templates.os.access', return_value=False):
+        with caplog.at_level(logging.DEBUG):
+            renderer = Renderer(get_fixture_path('templates'), '', cache_config={'directory': str(tmp_path)})
+
+    assert renderer.render('valid', {'test_key': 'test_value'}) == 'test_value;'
+    assert renderer._env.bytecode_cache is None  # pylint: disable=protected-access
+    assert f'Directory {tmp_path} is not writable' in caplog.text
+
+
+def test_render_bytecode_cache_disabled(tmp_path):
+    """Should not use the persistent bytecode cache if disabled in the configuration."""
+    renderer = Renderer(get_fixture_path('templates'), '', cache_config={'disabled': True})
+
+    assert renderer.render('valid', {'test_key': 'test_value'}) == 'test_value;'
+    assert renderer._env.bytecode_cache is None  # pylint: disable=protected-access
+    assert not list(tmp_path.iterdir())
@@ -9,6 +9,7 @@ class Whitelist:
 
 
 whitelist_tests = Whitelist()
+whitelist_tests.conftest.isolated_tempdir
 whitelist_tests.unit.test_devices.TestDevices.setup_method
 whitelist_tests.unit.test_devices.TestDevices.setup_method_fixture
 whitelist_tests.unit.test_netbox.TestBaseNetboxData.netbox_data._get_key_raise
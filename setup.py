@@ -30,10 +30,10 @@ EXTRAS_REQUIRE = {
         'pytest-xdist>=1.15.0',
         'pytest>=3.3.0',
         'requests-mock',
-        'sphinx_rtd_theme>=0.1.6',
+        'sphinx-autoapi>=3.0.0',
+        'sphinx_rtd_theme>=1.0.0',
         'sphinx-argparse>=0.1.15',
-        'Sphinx>=1.4.9',
-        'types-pkg_resources',
+        'Sphinx>=6.2',
         'types-PyYAML',
         'types-requests',
     ],